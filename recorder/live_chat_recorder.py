@@ -4,16 +4,39 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
+import logging.handlers
 import os
 import re
 import shutil
-import subprocess
+import signal
 import sys
 import time
 from dataclasses import dataclass
 
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that caches the formatted timestamp per second.
+
+    Every forwarded yt-dlp line is logged, and on a busy stream many records
+    land in the same second; reformatting via strftime for each one is pure
+    waste on the hot path.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ts_cache: tuple[int | None, str] = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        cached_sec, cached_str = self._ts_cache
+        if sec != cached_sec:
+            cached_str = time.strftime(datefmt or self.default_time_format, time.localtime(sec))
+            self._ts_cache = (sec, cached_str)
+        return cached_str
+
+
 def _setup_logger(repo_root: str, channel: str) -> logging.Logger:
     log_dir = os.path.join(repo_root, "logs")
     os.makedirs(log_dir, exist_ok=True)
@@ -21,33 +44,53 @@ def _setup_logger(repo_root: str, channel: str) -> logging.Logger:
     logger = logging.getLogger(f"chat:{channel}")
     logger.setLevel(logging.INFO)
 
-    fmt = logging.Formatter("[%(asctime)s] [%(name)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    fmt = _CachedTimeFormatter("[%(asctime)s] [%(name)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
     fh = logging.FileHandler(os.path.join(log_dir, f"chat_{channel}.log"), encoding="utf-8")
     fh.setFormatter(fmt)
+    # Every forwarded yt-dlp chat line goes through this logger, so batch
+    # file writes instead of flushing per record; warnings and above still
+    # flush immediately, and logging.shutdown drains the buffer on exit.
+    mh = logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.WARNING, target=fh)
     sh = logging.StreamHandler(sys.stdout)
     sh.setFormatter(fmt)
 
     if not logger.handlers:
-        logger.addHandler(fh)
+        logger.addHandler(mh)
         logger.addHandler(sh)
     return logger
 
 
-AUTH_PATTERNS = [
-    re.compile(r"sign in to confirm.*not a bot", re.IGNORECASE),
-    re.compile(r"use --cookies-from-browser|use --cookies", re.IGNORECASE),
-    re.compile(r"http error 403", re.IGNORECASE),
-    re.compile(r"http error 429", re.IGNORECASE),
-    re.compile(r"forbidden", re.IGNORECASE),
-    re.compile(r"too many requests", re.IGNORECASE),
-    re.compile(r"challenge solving failed", re.IGNORECASE),
-    re.compile(r"remote components.*were skipped", re.IGNORECASE),
-]
+def _flush_file_log(logger: logging.Logger) -> None:
+    """Drain the MemoryHandler so the file log is current before a long sleep."""
+    for handler in logger.handlers:
+        if isinstance(handler, logging.handlers.MemoryHandler):
+            handler.flush()
+
+
+def _handle_sigterm(signum, frame):
+    # The helper stops recorders with SIGTERM, which bypasses the atexit
+    # hook that would normally drain the MemoryHandler — flush explicitly
+    # so the last buffered lines land in the file log.
+    logging.shutdown()
+    raise SystemExit(0)
+
+
+# Single alternations instead of lists of patterns: one regex scan per line
+# rather than N searches through a generator expression.
+AUTH_BLOCK_RE = re.compile(
+    r"sign in to confirm.*not a bot"
+    r"|use --cookies-from-browser|use --cookies"
+    r"|http error 403"
+    r"|http error 429"
+    r"|forbidden"
+    r"|too many requests"
+    r"|challenge solving failed"
+    r"|remote components.*were skipped",
+    re.IGNORECASE,
+)
 
-NOT_LIVE_PATTERNS = [
-    re.compile(r"the channel is not currently live", re.IGNORECASE),
-    re.compile(r"not currently live", re.IGNORECASE),
-]
+# "not currently live" also covers "the channel is not currently live".
+NOT_LIVE_RE = re.compile(r"not currently live", re.IGNORECASE)
 
 BEGIN_IN_RE = re.compile(
     r"this live event will begin in\s+(\d+)\s+(second|seconds|minute|minutes|hour|hours|day|days)",
@@ -92,16 +135,13 @@ def _parse_begins_in_seconds(line: str) -> int | None:
     return n * mult
 
 
-def run_yt_dlp(cmd: list[str], logger: logging.Logger, stall_seconds: int = 240) -> RunSummary:
+async def run_yt_dlp(cmd: list[str], logger: logging.Logger, stall_seconds: int = 240) -> RunSummary:
     logger.info("▶️ Chat command: %s", " ".join(cmd))
 
-    proc = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-        universal_newlines=True,
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
     )
 
     saw_write_activity = False
@@ -112,18 +152,18 @@ def run_yt_dlp(cmd: list[str], logger: logging.Logger, stall_seconds: int = 240)
 
     try:
         assert proc.stdout is not None
-        for raw in proc.stdout:
-            line = raw.rstrip("\n")
+        async for raw in proc.stdout:
+            line = raw.decode("utf-8", "replace").rstrip("\n")
             logger.info(line)
 
             if any(marker in line for marker in CHAT_ACTIVITY_MARKERS):
                 saw_write_activity = True
                 last_activity = time.time()
 
-            if any(p.search(line) for p in AUTH_PATTERNS):
+            if AUTH_BLOCK_RE.search(line):
                 saw_auth_block = True
 
-            if any(p.search(line) for p in NOT_LIVE_PATTERNS):
+            if NOT_LIVE_RE.search(line):
                 not_live = True
 
             begins = _parse_begins_in_seconds(line)
@@ -143,13 +183,13 @@ def run_yt_dlp(cmd: list[str], logger: logging.Logger, stall_seconds: int = 240)
             pass
 
     try:
-        rc = proc.wait(timeout=5)
-    except subprocess.TimeoutExpired:
+        rc = await asyncio.wait_for(proc.wait(), timeout=5)
+    except asyncio.TimeoutError:
         try:
             proc.kill()
         except Exception:
             pass
-        rc = proc.wait()
+        rc = await proc.wait()
 
     return RunSummary(
         return_code=rc,
@@ -160,10 +200,18 @@ def run_yt_dlp(cmd: list[str], logger: logging.Logger, stall_seconds: int = 240)
     )
 
 
+# Shared across recorder restarts and channels so the expensive player-JS
+# parse is fetched once, not once per yt-dlp invocation.
+CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, ".ytdlp-cache"))
+
+
 def build_base_cmd(yt_dlp_bin: str, channel: str, out_dir: str) -> list[str]:
+    os.makedirs(CACHE_DIR, exist_ok=True)
     out_tmpl = os.path.join(out_dir, "%(epoch>%Y-%m-%d_%H-%M-%S)s_%(id)s.%(ext)s")
     return [
         yt_dlp_bin,
+        "--cache-dir",
+        CACHE_DIR,
         "--newline",
         "--no-color",
         "--ignore-errors",
@@ -210,42 +258,17 @@ def compute_sleep_seconds(summary: RunSummary, poll_slow: int, poll_fast: int, f
     return poll_fast
 
 
-def main() -> int:
+async def watch_channel(args: argparse.Namespace, channel: str, out_dir: str, yt_dlp_bin: str, cookie_args: list[str]) -> None:
     repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
-    p = argparse.ArgumentParser()
-    p.add_argument("channel")
-    p.add_argument("out_dir")
-    g = p.add_mutually_exclusive_group()
-    g.add_argument("--cookies", dest="cookies", help="cookies.txt for yt-dlp")
-    g.add_argument("--cookies-from-browser", dest="cookies_from_browser", help="yt-dlp browser name (e.g. firefox)")
-    p.add_argument("--cookie-fallback", action="store_true", help="Try without cookies first, then with cookies if AUTH problems detected")
-    p.add_argument("--yt-dlp-bin", default="yt-dlp", help="Absolute path or command name for yt-dlp")
-    p.add_argument("--stall-seconds", type=int, default=240, help="Restart if no chat write activity for this long (only after chat starts)")
-    p.add_argument("--poll-slow", type=int, default=240, help="Seconds between checks when channel is not live")
-    p.add_argument("--poll-fast", type=int, default=60, help="Seconds between checks when close to live or in fast mode")
-    p.add_argument("--fast-enter-minutes", type=int, default=30, help="Enter fast mode when scheduled start is within this many minutes")
-    p.add_argument("--late-grace-minutes", type=int, default=20, help="Keep fast mode for this many minutes AFTER scheduled start")
-    p.add_argument("--auth-backoff-initial", type=int, default=600, help="Initial backoff after auth/bot blocks in seconds")
-    p.add_argument("--auth-backoff-max", type=int, default=3600, help="Maximum backoff after repeated auth/bot blocks in seconds")
-    p.add_argument("--prefer-cookies-minutes", type=int, default=180, help="After an auth problem, prefer starting WITH cookies for this many minutes")
-    args = p.parse_args()
-
-    os.makedirs(args.out_dir, exist_ok=True)
-    logger = _setup_logger(repo_root, args.channel)
-
-    yt_dlp_bin = os.path.expanduser(args.yt_dlp_bin)
-    if not os.path.isabs(yt_dlp_bin):
-        yt_dlp_bin = shutil.which(yt_dlp_bin) or yt_dlp_bin
+    os.makedirs(out_dir, exist_ok=True)
+    logger = _setup_logger(repo_root, channel)
     logger.info("Using yt-dlp binary: %s", yt_dlp_bin)
 
-    cookie_args: list[str] = []
-    if args.cookies:
-        cookie_args = ["--cookies", os.path.expanduser(args.cookies)]
-    elif args.cookies_from_browser:
-        cookie_args = ["--cookies-from-browser", args.cookies_from_browser]
-
-    base_cmd = build_base_cmd(yt_dlp_bin, args.channel, args.out_dir)
+    base_cmd = build_base_cmd(yt_dlp_bin, channel, out_dir)
+    # Both the cookie-first and fallback paths use the same spliced command,
+    # so build it once here instead of copy()+insert on every poll.
+    cookie_cmd = base_cmd[:1] + cookie_args + base_cmd[1:]
     fast_mode_until_ts: float | None = None
     fast_enter_threshold = max(1, args.fast_enter_minutes) * 60
     late_grace_seconds = max(0, args.late_grace_minutes) * 60
@@ -272,32 +295,33 @@ def main() -> int:
             and time.time() < prefer_cookies_until_ts
         )
 
-        cmd = base_cmd.copy()
         if start_with_cookies:
-            cmd[1:1] = cookie_args
+            cmd = cookie_cmd
             logger.info("🍪 Preferring cookies-first mode due to recent auth/bot block.")
+        else:
+            cmd = base_cmd
 
-        summary = run_yt_dlp(cmd, logger, stall_seconds=args.stall_seconds)
+        summary = await run_yt_dlp(cmd, logger, stall_seconds=args.stall_seconds)
         maybe_update_fast_mode(summary)
 
         if summary.return_code == 0 and summary.saw_write_activity:
             auth_failures = 0
             logger.info("✅ Chat recorder cycle completed; next check in 15s...")
-            time.sleep(15)
+            _flush_file_log(logger)
+            await asyncio.sleep(15)
             continue
 
         if args.cookie_fallback and cookie_args and (not start_with_cookies) and summary.saw_auth_block:
             logger.info("🔁 Auth/challenge issue detected — retrying chat WITH cookies...")
-            cmd2 = base_cmd.copy()
-            cmd2[1:1] = cookie_args
-            summary2 = run_yt_dlp(cmd2, logger, stall_seconds=args.stall_seconds)
+            summary2 = await run_yt_dlp(cookie_cmd, logger, stall_seconds=args.stall_seconds)
             maybe_update_fast_mode(summary2)
 
             if summary2.return_code == 0 and summary2.saw_write_activity:
                 auth_failures = 0
                 prefer_cookies_until_ts = time.time() + max(1, args.prefer_cookies_minutes) * 60
                 logger.info("✅ Chat recorder cycle completed with cookies; next check in 15s...")
-                time.sleep(15)
+                _flush_file_log(logger)
+                await asyncio.sleep(15)
                 continue
 
             summary = summary2
@@ -311,7 +335,8 @@ def main() -> int:
                 auth_failures,
                 sleep_s,
             )
-            time.sleep(sleep_s)
+            _flush_file_log(logger)
+            await asyncio.sleep(sleep_s)
             continue
 
         if summary.not_live or summary.begins_in_seconds is not None:
@@ -319,7 +344,56 @@ def main() -> int:
 
         sleep_s = compute_sleep_seconds(summary, args.poll_slow, args.poll_fast, fast_mode_until_ts)
         logger.info("⏳ No chat recording. Next check in %ss...", sleep_s)
-        time.sleep(sleep_s)
+        _flush_file_log(logger)
+        await asyncio.sleep(sleep_s)
+
+
+async def watch_all(args: argparse.Namespace, yt_dlp_bin: str, cookie_args: list[str]) -> None:
+    # With one channel, out_dir is used as-is (the helper's contract); with
+    # several, each channel records into a subdirectory named after it.
+    if len(args.channel) == 1:
+        pairs = [(args.channel[0], args.out_dir)]
+    else:
+        pairs = [(ch, os.path.join(args.out_dir, ch)) for ch in args.channel]
+
+    await asyncio.gather(*(
+        watch_channel(args, channel, out_dir, yt_dlp_bin, cookie_args)
+        for channel, out_dir in pairs
+    ))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("channel", nargs="+", help="Channel handle(s); with several, out_dir becomes a base directory")
+    p.add_argument("out_dir")
+    g = p.add_mutually_exclusive_group()
+    g.add_argument("--cookies", dest="cookies", help="cookies.txt for yt-dlp")
+    g.add_argument("--cookies-from-browser", dest="cookies_from_browser", help="yt-dlp browser name (e.g. firefox)")
+    p.add_argument("--cookie-fallback", action="store_true", help="Try without cookies first, then with cookies if AUTH problems detected")
+    p.add_argument("--yt-dlp-bin", default="yt-dlp", help="Absolute path or command name for yt-dlp")
+    p.add_argument("--stall-seconds", type=int, default=240, help="Restart if no chat write activity for this long (only after chat starts)")
+    p.add_argument("--poll-slow", type=int, default=240, help="Seconds between checks when channel is not live")
+    p.add_argument("--poll-fast", type=int, default=60, help="Seconds between checks when close to live or in fast mode")
+    p.add_argument("--fast-enter-minutes", type=int, default=30, help="Enter fast mode when scheduled start is within this many minutes")
+    p.add_argument("--late-grace-minutes", type=int, default=20, help="Keep fast mode for this many minutes AFTER scheduled start")
+    p.add_argument("--auth-backoff-initial", type=int, default=600, help="Initial backoff after auth/bot blocks in seconds")
+    p.add_argument("--auth-backoff-max", type=int, default=3600, help="Maximum backoff after repeated auth/bot blocks in seconds")
+    p.add_argument("--prefer-cookies-minutes", type=int, default=180, help="After an auth problem, prefer starting WITH cookies for this many minutes")
+    args = p.parse_args()
+
+    yt_dlp_bin = os.path.expanduser(args.yt_dlp_bin)
+    if not os.path.isabs(yt_dlp_bin):
+        yt_dlp_bin = shutil.which(yt_dlp_bin) or yt_dlp_bin
+
+    cookie_args: list[str] = []
+    if args.cookies:
+        cookie_args = ["--cookies", os.path.expanduser(args.cookies)]
+    elif args.cookies_from_browser:
+        cookie_args = ["--cookies-from-browser", args.cookies_from_browser]
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    asyncio.run(watch_all(args, yt_dlp_bin, cookie_args))
+    return 0
 
 
 if __name__ == "__main__":
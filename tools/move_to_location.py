@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
+import ctypes
+import errno
 import os
+import select
+import signal
 import sys
 import time
 import shutil
@@ -8,8 +12,13 @@ import re
 import json
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from contextlib import contextmanager
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml, ~10x faster
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 # Resolve repo root based on this file's location: <repo>/tools/move_to_location.py
 TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,7 +27,8 @@ REPO_ROOT = os.path.abspath(os.path.join(TOOLS_DIR, os.pardir))
 CONFIG_PATH = os.path.join(REPO_ROOT, 'channellist.yaml')
 TEMP_BASE = os.path.join(REPO_ROOT, 'temp')
 
-POLL_INTERVAL = 240  # seconds between scans
+POLL_INTERVAL = 240  # seconds between scans (fallback when inotify is unavailable)
+EVENT_RESCAN_DELAY = 5  # seconds between scans after an inotify close-write event
 
 # Typical yt-dlp temp/aux files to ignore
 # NOTE: .log added so recorder/log output files are never moved
@@ -31,6 +41,40 @@ CHAT_JSON_EXTENSIONS = {'.json', '.live_chat.json'}
 # Example: 2026-02-23_21-31-56__dYfVubrMnU...f136.mp4 and ...f140.mp4
 FRAGMENT_RE = re.compile(r"^(?P<prefix>.+?)\.f(?P<fmt>\d{3,4})\.(?P<ext>mp4|mkv|webm|m4a|mp3|aac)$", re.IGNORECASE)
 
+# statx(AT_STATX_DONT_SYNC, STATX_SIZE) returns cached size metadata without
+# forcing an inode refresh — noticeably cheaper than a full stat when the
+# target lives on networked storage. Falls back to DirEntry.stat() elsewhere.
+_STATX_SIZE = 0x200
+_AT_STATX_DONT_SYNC = 0x4000
+_AT_FDCWD = -100
+
+_statx = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc_statx = ctypes.CDLL(None, use_errno=True).statx
+        _libc_statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.c_char_p]
+
+        def _statx(path: str) -> int:
+            # struct statx: stx_mask at offset 0 (u32), stx_size at 40 (u64)
+            buf = ctypes.create_string_buffer(256)
+            if _libc_statx(_AT_FDCWD, os.fsencode(path), _AT_STATX_DONT_SYNC, _STATX_SIZE, buf) != 0:
+                raise OSError(ctypes.get_errno(), f"statx failed for '{path}'")
+            if not int.from_bytes(buf.raw[0:4], 'little') & _STATX_SIZE:
+                raise OSError(errno.EINVAL, f"statx returned no size for '{path}'")
+            return int.from_bytes(buf.raw[40:48], 'little')
+    except Exception:
+        _statx = None
+
+
+def entry_size(entry: os.DirEntry) -> int:
+    if _statx is not None:
+        try:
+            return _statx(entry.path)
+        except OSError:
+            pass
+    return entry.stat().st_size
+
+
 # Import chat renderer (chat_render.py is in the same tools/ directory)
 render_chat_json = None
 try:
@@ -63,13 +107,28 @@ def log(msg: str):
     logger.info(msg)
 
 
+# Parse cache for load_channels(): keyed on the config file's mtime so each
+# scan costs a stat() instead of a YAML parse (same scheme as the helper).
+_config_cache = {'mtime': None, 'channels': []}
+
+
 def load_channels():
     if not os.path.isfile(CONFIG_PATH):
         log(f"⚠️ Config file not found: {CONFIG_PATH}")
         return []
-    with open(CONFIG_PATH, 'r') as f:
-        config = yaml.safe_load(f) or {}
-        return config.get('channels', [])
+    try:
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+        if _config_cache['mtime'] == mtime:
+            return _config_cache['channels']
+        with open(CONFIG_PATH, 'r') as f:
+            config = yaml.load(f, Loader=YamlLoader) or {}
+    except Exception as e:
+        log(f"⚠️ Failed to load config {CONFIG_PATH}: {e}")
+        return []
+    channels = config.get('channels', [])
+    _config_cache['mtime'] = mtime
+    _config_cache['channels'] = channels
+    return channels
 
 
 def temp_dir_for_channel(name: str) -> str:
@@ -172,19 +231,155 @@ def merge_av_pair(video_path: str, audio_path: str, out_path: str) -> bool:
         return False
 
 
-@contextmanager
-def pushd(path: str):
+def move_file(src: str, dest: str):
     """
-    Temporarily chdir to `path` and restore after.
-    Used so chat rendering outputs are created "in place"
-    (next to the moved chat json).
+    Move src to dest. On the same filesystem this is a single rename; across
+    filesystems (the normal case here: temp SSD -> archive disk) the data is
+    streamed with os.sendfile, which copies page-cache to page-cache in the
+    kernel instead of round-tripping every byte through a Python buffer the
+    way shutil.move does.
     """
-    prev = os.getcwd()
     try:
-        os.chdir(path)
-        yield
-    finally:
-        os.chdir(prev)
+        # One renameat2 syscall, atomic, overwrites a stale dest; no stat or
+        # samefile probing beforehand, and portable unlike bare os.rename.
+        os.replace(src, dest)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        remaining = os.fstat(src_fd).st_size
+        offset = 0
+        use_sendfile = hasattr(os, 'sendfile')
+        while use_sendfile and remaining > 0:
+            try:
+                sent = os.sendfile(dst_fd, src_fd, offset, min(remaining, 1 << 30))
+            except OSError:
+                # sendfile not supported for this fd pairing
+                use_sendfile = False
+                break
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+        if not use_sendfile:
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+    shutil.copystat(src, dest)
+    os.unlink(src)
+
+
+# Chat rendering shells out to ffmpeg and can take minutes per JSON; run it
+# in a small pool so the move/stability loop never blocks behind a render.
+_render_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-render")
+_render_futures: list = []
+
+
+def reap_render_futures():
+    for future in [f for f in _render_futures if f.done()]:
+        _render_futures.remove(future)
+        try:
+            future.result()
+        except Exception as e:
+            log(f"⚠️ Chat rendering failed: {e}")
+
+
+def _open_file_targets():
+    """
+    Best-effort snapshot of every file currently held open by any process,
+    via /proc/*/fd (Linux only). Returns None when the snapshot can't be
+    taken — callers must then rely on size stability alone.
+
+    yt-dlp takes no advisory locks, so flock() probing can't tell whether a
+    file is still being written; the kernel's fd table can.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        pids = [p for p in os.listdir('/proc') if p.isdigit()]
+    except OSError:
+        return None
+
+    targets = set()
+    for pid in pids:
+        fd_dir = f'/proc/{pid}/fd'
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            # Process exited, or not ours to inspect.
+            continue
+        for fd in fds:
+            try:
+                targets.add(os.readlink(f'{fd_dir}/{fd}'))
+            except OSError:
+                continue
+    return targets
+
+
+# A file must be untouched this long before the fast path will trust
+# /proc: ffmpeg-muxed outputs are written without a .part suffix and can
+# sit between two write bursts when a snapshot is taken.
+FAST_MOVE_MIN_AGE = 5
+
+
+def _file_is_open(real_path):
+    """
+    Fresh single-file version of _open_file_targets, taken immediately
+    before a fast move commits. Returns True on any doubt so callers fall
+    back to the stability wait.
+    """
+    if not sys.platform.startswith('linux'):
+        return True
+    try:
+        pids = [p for p in os.listdir('/proc') if p.isdigit()]
+    except OSError:
+        return True
+    for pid in pids:
+        fd_dir = f'/proc/{pid}/fd'
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(f'{fd_dir}/{fd}') == real_path:
+                    return True
+            except OSError:
+                continue
+    return False
+
+
+def _fast_move_ready(entry, src, open_targets):
+    """
+    Whether a newly-seen file may be moved without the stability wait.
+    /proc fd targets are fully resolved symlink-free paths, so both
+    membership tests compare against the file's realpath. The scan-wide
+    snapshot predates the directory walk and can miss writers that opened
+    the file since, so a candidate must also have been untouched for a few
+    seconds and pass a fresh per-file check right before the move.
+    """
+    if open_targets is None:
+        return False
+    real_src = os.path.realpath(src)
+    if real_src in open_targets:
+        return False
+    try:
+        if time.time() - entry.stat(follow_symlinks=False).st_mtime < FAST_MOVE_MIN_AGE:
+            return False
+    except OSError:
+        return False
+    return not _file_is_open(real_src)
+
+
+# Last-known path for each tracked (st_dev, st_ino) key, so stale-entry
+# logs can still name the file after it disappears or is renamed.
+_inode_paths: dict = {}
 
 
 def scan_once(seen_sizes: dict):
@@ -198,9 +393,18 @@ def scan_once(seen_sizes: dict):
       - If size changed: update size and wait for next scan.
     - After moving a chat JSON, render the chat "in place" (cwd=destination folder).
     - Remove entries from seen_sizes for files that disappeared.
+
+    seen_sizes is keyed by (st_dev, st_ino) rather than path, so the
+    stability history survives yt-dlp's .part -> final renames instead of
+    restarting the wait for the "same" file under its new name.
     """
+    reap_render_futures()
+
     channels = load_channels()
-    current_paths = set()
+    current_keys = set()
+    # One /proc walk per scan lets us move files nobody holds open without
+    # waiting a full stability cycle first.
+    open_targets = _open_file_targets()
 
     for cfg in channels:
         name = cfg.get('name')
@@ -215,76 +419,92 @@ def scan_once(seen_sizes: dict):
 
         target_dir = os.path.abspath(os.path.join(REPO_ROOT, target))
         ensure_dir(target_dir)
+        # Hoisted so the per-entry loop below builds destinations with a
+        # plain concatenation instead of os.path.join per file.
+        target_prefix = target_dir + os.sep
+
+        # One stat for the directory gives st_dev for every entry in it;
+        # DirEntry.inode() comes straight from the dirent, no extra syscall.
+        dir_dev = os.stat(temp_dir).st_dev
 
         # First pass: update stability tracking
         entries = list(os.scandir(temp_dir))
 
         for entry in entries:
-            if not entry.is_file():
+            if not entry.is_file(follow_symlinks=False):
                 continue
 
             src = entry.path
-            current_paths.add(src)
+            key = (dir_dev, entry.inode())
+            current_keys.add(key)
+            _inode_paths[key] = src
 
             base_name = entry.name
-            _, ext = os.path.splitext(base_name)
-            ext = ext.lower()
+            # Cheaper than os.path.splitext; dot > 0 keeps splitext's
+            # behaviour of treating dotfiles as extensionless.
+            dot = base_name.rfind('.')
+            ext = base_name[dot:].lower() if dot > 0 else ''
 
             # Never move logs (or other skipped extensions)
             if ext in SKIP_EXTENSIONS:
                 continue
 
             try:
-                size = os.path.getsize(src)
+                size = entry_size(entry)
             except OSError as e:
                 log(f"⚠️ Could not stat '{src}': {e}")
                 continue
 
-            if src not in seen_sizes:
-                seen_sizes[src] = size
-                log(f"👀 Tracking new file for stability: '{src}' (size={size})")
-                continue
-
-            prev_size = seen_sizes[src]
-            if size != prev_size:
-                seen_sizes[src] = size
-                log(f"⏳ File still changing: '{src}' (old={prev_size}, new={size})")
-                continue
+            if key not in seen_sizes:
+                # The stability wait exists only because we normally can't
+                # tell whether yt-dlp still has the file open. When /proc
+                # shows nobody does — re-verified per file right before
+                # the move — move it right away. Fragments are excluded:
+                # they go through the merge pass, which works off tracked
+                # sizes.
+                if not is_fragment_media(base_name) and _fast_move_ready(entry, src, open_targets):
+                    log(f"⚡ No process holds '{src}' open — moving without stability wait")
+                else:
+                    seen_sizes[key] = size
+                    log(f"👀 Tracking new file for stability: '{src}' (size={size})")
+                    continue
+            else:
+                prev_size = seen_sizes[key]
+                if size != prev_size:
+                    seen_sizes[key] = size
+                    log(f"⏳ File still changing: '{src}' (old={prev_size}, new={size})")
+                    continue
 
             # Never move fragmented A/V files; we will attempt to merge them first.
             if is_fragment_media(base_name):
                 # Keep tracking stability, but don't move.
                 continue
 
-            dest = os.path.join(target_dir, base_name)
+            dest = target_prefix + base_name
             is_chat = is_chat_json(base_name)
 
             try:
                 log(f"➡️ Moving finished file '{src}' -> '{dest}'")
-                shutil.move(src, dest)
-                del seen_sizes[src]
+                move_file(src, dest)
+                seen_sizes.pop(key, None)
+                _inode_paths.pop(key, None)
             except Exception as e:
                 log(f"⚠️ Failed to move '{src}' -> '{dest}': {e}")
                 continue
 
-            # If this is a chat JSON and we have a renderer, render "in place"
-            # by running from the destination directory.
+            # If this is a chat JSON and we have a renderer, queue the render:
+            # yt-chat-to-video derives its output from the absolute JSON path,
+            # so the video still lands next to the moved file.
             if is_chat and render_chat_json is not None:
-                try:
-                    dest_dir = os.path.dirname(os.path.abspath(dest))
-                    with pushd(dest_dir):
-                        log(f"🎬 Rendering chat JSON in place (cwd='{dest_dir}') for '{dest}'")
-                        render_chat_json(dest)
-                except Exception as e:
-                    log(f"⚠️ Chat rendering failed for '{dest}': {e}")
+                log(f"🎬 Queued chat render for '{dest}'")
+                _render_futures.append(_render_pool.submit(render_chat_json, dest))
 
         # Second pass (per-channel): if we have stable .f### files, try to merge them into a single MP4.
         stable_fragment_files: list[str] = []
-        current_paths_in_dir = set()
+        fragment_keys: dict = {}
         for entry in entries:
-            if not entry.is_file():
+            if not entry.is_file(follow_symlinks=False):
                 continue
-            current_paths_in_dir.add(entry.path)
             name_lower = entry.name.lower()
             if any(name_lower.endswith(x) for x in SKIP_EXTENSIONS):
                 continue
@@ -292,11 +512,13 @@ def scan_once(seen_sizes: dict):
                 continue
             # treat as stable if tracked and unchanged since last scan
             try:
-                size = os.path.getsize(entry.path)
+                size = entry_size(entry)
             except OSError:
                 continue
-            if entry.path in seen_sizes and seen_sizes[entry.path] == size:
+            frag_key = (dir_dev, entry.inode())
+            if seen_sizes.get(frag_key) == size:
                 stable_fragment_files.append(entry.path)
+                fragment_keys[entry.path] = frag_key
 
         # Group stable fragments by shared prefix
         groups: dict[str, list[str]] = {}
@@ -337,39 +559,146 @@ def scan_once(seen_sizes: dict):
                         os.remove(f)
                     except Exception:
                         pass
-                    seen_sizes.pop(f, None)
+                    fk = fragment_keys.get(f)
+                    if fk is not None:
+                        seen_sizes.pop(fk, None)
+                        _inode_paths.pop(fk, None)
                 # Track new merged output on next scan
                 try:
-                    seen_sizes[out_path] = os.path.getsize(out_path)
+                    st = os.stat(out_path)
+                    out_key = (st.st_dev, st.st_ino)
+                    seen_sizes[out_key] = st.st_size
+                    _inode_paths[out_key] = out_path
+                    current_keys.add(out_key)
                     log(f"✅ Merge complete, created '{out_path}'")
                 except Exception:
                     pass
 
     # Clean up seen_sizes entries for files that no longer exist or are no longer in temp
-    stale_paths = [p for p in list(seen_sizes.keys()) if p not in current_paths]
-    for p in stale_paths:
-        log(f"🧹 Removing stale tracking entry for '{p}'")
-        del seen_sizes[p]
+    stale_keys = [k for k in list(seen_sizes.keys()) if k not in current_keys]
+    for k in stale_keys:
+        log(f"🧹 Removing stale tracking entry for '{_inode_paths.get(k, k)}'")
+        del seen_sizes[k]
+        _inode_paths.pop(k, None)
+
+
+class InotifyWatcher:
+    """
+    Best-effort inotify wrapper (Linux only, raw ctypes — no extra deps).
+    Wakes the scan loop as soon as a writer closes or moves a file in a
+    watched temp dir, instead of waiting out the full POLL_INTERVAL.
+    When inotify is unavailable the loop degrades to pure timer polling.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_NONBLOCK = 0x00000800
+
+    def __init__(self):
+        self._fd = None
+        self._libc = None
+        self._watched = set()
+        if sys.platform.startswith('linux'):
+            try:
+                self._libc = ctypes.CDLL(None, use_errno=True)
+                fd = self._libc.inotify_init1(self.IN_NONBLOCK)
+                if fd >= 0:
+                    self._fd = fd
+            except Exception:
+                self._fd = None
+
+    @property
+    def active(self) -> bool:
+        return self._fd is not None
+
+    def watch(self, path: str):
+        if self._fd is None or path in self._watched:
+            return
+        try:
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(path), self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+            )
+            if wd >= 0:
+                self._watched.add(path)
+        except Exception:
+            pass
+
+    def wait(self, timeout: float, wake_fd=None) -> bool:
+        """Block until an inotify event arrives, a byte lands on wake_fd
+        (signal delivery via set_wakeup_fd), or timeout elapses. Returns True
+        if an inotify event fired; fds are drained so stale data can't
+        re-wake."""
+        fds = [fd for fd in (self._fd, wake_fd) if fd is not None]
+        if not fds:
+            time.sleep(timeout)
+            return False
+        readable, _, _ = select.select(fds, [], [], timeout)
+        for fd in readable:
+            try:
+                while True:
+                    if not os.read(fd, 4096):
+                        break
+            except (BlockingIOError, OSError):
+                pass
+        return self._fd is not None and self._fd in readable
+
+
+# Set from the SIGTERM/SIGINT handler; checked between scans so an in-flight
+# move or merge always completes instead of being killed halfway through.
+_shutdown = False
 
 
-def main_loop():
+def request_shutdown(signum, frame):
+    global _shutdown
+    _shutdown = True
+
+
+def main_loop(wake_fd=None):
     log("🚚 move_to_location started")
     log(f"   Repo root: {REPO_ROOT}")
     log(f"   Temp base: {TEMP_BASE}")
     ensure_dir(TEMP_BASE)
 
     seen_sizes = {}
+    watcher = InotifyWatcher()
+    if watcher.active:
+        log("👁️ inotify available: reacting to file close events (timer scan kept as fallback)")
 
-    while True:
+    timeout = POLL_INTERVAL
+    while not _shutdown:
         try:
             scan_once(seen_sizes)
+            if watcher.active:
+                for cfg in load_channels():
+                    name = cfg.get('name')
+                    if name:
+                        temp_dir = temp_dir_for_channel(name)
+                        if os.path.isdir(temp_dir):
+                            watcher.watch(temp_dir)
         except Exception as e:
             log(f"⚠️ Error during scan: {e}")
-        time.sleep(POLL_INTERVAL)
+
+        # A close-write event means a file likely just finished: rescan after
+        # a short settle so the two-scan stability check confirms quickly,
+        # instead of paying up to two full poll intervals.
+        if watcher.wait(timeout, wake_fd):
+            timeout = EVENT_RESCAN_DELAY
+        else:
+            timeout = POLL_INTERVAL
+
+    log("🧹 Shutdown requested — waiting for in-flight chat renders...")
+    _render_pool.shutdown(wait=True, cancel_futures=True)
+    log("👋 move_to_location exiting cleanly.")
 
 
 if __name__ == '__main__':
-    try:
-        main_loop()
-    except KeyboardInterrupt:
-        log("🧹 move_to_location interrupted, exiting cleanly.")
+    # Route SIGTERM/SIGINT through a wakeup pipe: the handlers only set a
+    # flag (so moves/merges finish), while the byte written by the kernel to
+    # the pipe interrupts the select() sleep immediately.
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+    main_loop(wake_r)
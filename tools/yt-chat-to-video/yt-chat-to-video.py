@@ -1,12 +1,34 @@
 import os
 import re
 import argparse
+import shutil
 import subprocess
+import tempfile
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 import math
+from bisect import bisect_left
+from collections import deque
+
+# orjson parses large chat dumps several times faster than stdlib json and
+# consumes bytes directly; fall back silently when it isn't installed.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# httpx with HTTP/2 multiplexes every image fetch over one connection,
+# where HTTP/1.1 keep-alive still serializes per socket; optional, with a
+# requests fallback below.
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # -------- Helpers to normalize YouTube chat records --------
 def _extract_renderer_and_times(obj):
@@ -69,6 +91,12 @@ def _extract_renderer_and_times(obj):
     return None, None, None
 
 
+# Above this size, skip the whole-file parse attempt and stream line by
+# line: huge dumps are JSONL in practice, and holding the raw bytes plus
+# a splitlines copy in memory doubles peak RSS for nothing.
+_WHOLE_FILE_PARSE_LIMIT = 64 * 1024 * 1024
+
+
 def _load_chat_actions(path):
     """
     Load chat as a list of 'action-like' dicts that _extract_renderer_and_times understands.
@@ -77,42 +105,80 @@ def _load_chat_actions(path):
       - Single JSON object with 'actions'
       - JSON array of action objects
     """
-    with open(path, "r", encoding="utf-8") as f:
-        raw = f.read().strip()
-
-    # Try whole-file JSON first
-    try:
-        data = json.loads(raw)
-        # Case A: single dict with 'actions'
-        if isinstance(data, dict) and 'actions' in data and isinstance(data['actions'], list):
-            return data['actions']
-        # Some yt-dlp replays: top-level has one action
-        if isinstance(data, dict) and ('replayChatItemAction' in data or 'addChatItemAction' in data):
-            return [data]
-        # Case B: array of actions
-        if isinstance(data, list):
-            return data
-        # Fall back to JSONL
-        raise ValueError("Not a simple dict/list structure; try JSONL fallback")
-    except Exception:
-        pass
-
-    # JSONL fallback: parse line-by-line, tolerate garbage lines
-    actions = []
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
+    # Try whole-file JSON first (small files only). Read bytes: both
+    # parsers accept them, and orjson skips a decode pass.
+    if os.path.getsize(path) <= _WHOLE_FILE_PARSE_LIMIT:
+        with open(path, "rb") as f:
+            raw = f.read().strip()
         try:
-            obj = json.loads(line)
-            actions.append(obj)
+            data = _json_loads(raw)
+            # Case A: single dict with 'actions'
+            if isinstance(data, dict) and 'actions' in data and isinstance(data['actions'], list):
+                return data['actions']
+            # Some yt-dlp replays: top-level has one action
+            if isinstance(data, dict) and ('replayChatItemAction' in data or 'addChatItemAction' in data):
+                return [data]
+            # Case B: array of actions
+            if isinstance(data, list):
+                return data
+            # Fall back to JSONL
+            raise ValueError("Not a simple dict/list structure; try JSONL fallback")
         except Exception:
-            continue
+            pass
+        del raw
+
+    # JSONL: stream line by line so only the parsed objects stay resident,
+    # tolerating garbage lines
+    actions = []
+    append = actions.append
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                append(_json_loads(line))
+            except Exception:
+                continue
     return actions
 
 
 # -------- Original small helpers --------
 
+# Compiled once: the key function runs for every avatar/emoji URL during
+# normalization, so skip the re-module cache lookup per call.
+UNSAFE_KEY_CHARS = re.compile(r'[^a-zA-Z0-9_-]')
+
+@lru_cache(maxsize=None)
+def GetCachedImageKey(path):
+    no_extension, _ = os.path.splitext(path)
+    no_protocol = no_extension.split('://', 1)[-1]
+    safe_key = UNSAFE_KEY_CHARS.sub('_', no_protocol)
+    return safe_key
+
+
+def _best_thumbnail_url(thumbnails, target):
+    """
+    Pick the smallest thumbnail still at least `target` px wide — less to
+    download than always grabbing by index, and no upscaling artifacts —
+    falling back to the largest (or first) entry available.
+    """
+    best_fit = None
+    largest = None
+    for thumb in thumbnails:
+        url = thumb.get('url')
+        if not url:
+            continue
+        w = thumb.get('width') or 0
+        if w >= target and (best_fit is None or w < best_fit[0]):
+            best_fit = (w, url)
+        if largest is None or w > largest[0]:
+            largest = (w, url)
+    if best_fit:
+        return best_fit[1]
+    return largest[1] if largest else None
+
+
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
@@ -141,6 +207,7 @@ parser.add_argument('--skip-emojis', action='store_true', help='Skip downloading
 parser.add_argument('--no-clip', action='store_false', help='Don\'t clip chat messages at the top')
 parser.add_argument('--use-cache', action='store_true', help='Cache downloaded avatars and emojis to disk')
 parser.add_argument('--proxy', help='HTTP/HTTPS/SOCKS proxy (e.g. socks5://127.0.0.1:1080/)')
+parser.add_argument('--encoder', help='Override the ffmpeg video encoder (e.g. h264_nvenc, h264_vaapi)')
 parser.add_argument('--fallback-gap-ms', type=int, default=1200,
                     help='Gap to use (ms) when timestamps collapse or duration is 0 (default: 1200)')
 args = parser.parse_args()
@@ -205,25 +272,52 @@ except Exception:
     chat_message_font = ImageFont.load_default()
     chat_author_font = ImageFont.load_default()
 
+# Memoized text measurement: authors and common chat words repeat
+# constantly, so almost all FreeType metric walks collapse into dict hits.
+# getlength computes only the kerning-aware advance width, skipping the
+# vertical-extent work getbbox does; keep a getbbox fallback for old Pillow.
+if hasattr(chat_message_font, "getlength"):
+    @lru_cache(maxsize=100_000)
+    def _word_width(word):
+        return int(chat_message_font.getlength(word))
+
+    @lru_cache(maxsize=None)
+    def _author_width(name):
+        return int(chat_author_font.getlength(name))
+else:
+    @lru_cache(maxsize=100_000)
+    def _word_width(word):
+        return chat_message_font.getbbox(word)[2]
+
+    @lru_cache(maxsize=None)
+    def _author_width(name):
+        return chat_author_font.getbbox(name)[2]
+
 # -------- Load & normalize chat records --------
 
 actions = _load_chat_actions(args.input_json_file)
 
-# First pass: base timestamp for LIVE logs
+# Single extraction pass: _extract_renderer_and_times does all the
+# dict-walking, so run it once per action and keep the results — the base
+# timestamp for LIVE logs falls out of the same sweep instead of a second
+# full walk over the actions.
+extracted = []
 first_ts_usec = None
 for obj in actions:
-    _, ts_usec, _ = _extract_renderer_and_times(obj)
+    renderer, ts_usec, offset_ms = _extract_renderer_and_times(obj)
     if ts_usec is not None:
         first_ts_usec = ts_usec if first_ts_usec is None else min(first_ts_usec, ts_usec)
+    if renderer:
+        extracted.append((renderer, ts_usec, offset_ms))
 
-# Build normalized message tuples: (time_ms, avatar_url, author, runs)
+# Build normalized message tuples: (time_ms, avatar_key, author, runs).
+# Image cache keys are computed once here, so the per-frame draw path is a
+# plain dict lookup; the key -> URL maps feed the pre-download step.
 messages = []
 raw_replay_offsets = []
-for obj in actions:
-    renderer, ts_usec, offset_ms = _extract_renderer_and_times(obj)
-    if not renderer:
-        continue
-
+avatar_urls_by_key = {}
+emoji_urls_by_key = {}
+for renderer, ts_usec, offset_ms in extracted:
     # Compute time_ms
     if offset_ms is not None:
         time_ms = int(offset_ms)
@@ -238,9 +332,12 @@ for obj in actions:
         continue
 
     # Extract fields
-    avatar_url = ""
+    avatar_key = ""
     try:
-        avatar_url = renderer['authorPhoto']['thumbnails'][0]['url']
+        avatar_url = _best_thumbnail_url(renderer['authorPhoto']['thumbnails'], chat_avatar_size)
+        if avatar_url:
+            avatar_key = GetCachedImageKey(avatar_url)
+            avatar_urls_by_key[avatar_key] = avatar_url
     except Exception:
         pass
 
@@ -254,8 +351,11 @@ for obj in actions:
                 if txt:
                     runs.append((0, txt))
             elif 'emoji' in run:
-                emoji_url = run['emoji']['image']['thumbnails'][0]['url']
-                runs.append((1, emoji_url))
+                emoji_url = _best_thumbnail_url(run['emoji']['image']['thumbnails'], chat_emoji_size)
+                if emoji_url:
+                    emoji_key = GetCachedImageKey(emoji_url)
+                    emoji_urls_by_key[emoji_key] = emoji_url
+                    runs.append((1, emoji_key))
     except Exception:
         # Tolerate odd messages (stickers, paid messages, etc.)
         # Keep an empty line so the author row still renders
@@ -265,7 +365,7 @@ for obj in actions:
     if not runs:
         runs.append((0, ""))
 
-    messages.append((int(time_ms), avatar_url, author, runs))
+    messages.append((int(time_ms), avatar_key, author, runs))
 
 if not messages:
     if end_time_seconds != 0:
@@ -282,8 +382,11 @@ if raw_replay_offsets:
         f"({min(raw_replay_offsets)/1000.0:.3f}s .. {max(raw_replay_offsets)/1000.0:.3f}s)"
     )
 
-# Sort and compute duration
-messages.sort(key=lambda m: m[0])
+# Sort and compute duration. Chat dumps are written in time order in
+# practice, so detect sortedness with one cheap pass and skip the sort —
+# and when one is needed, itemgetter avoids a Python-level key lambda.
+if any(a[0] > b[0] for a, b in zip(messages, messages[1:])):
+    messages.sort(key=itemgetter(0))
 print(
     "Normalized message time range: "
     f"{messages[0][0]}ms .. {messages[-1][0]}ms "
@@ -305,8 +408,8 @@ if duration_seconds <= 0.0 or all(m[0] == messages[0][0] for m in messages):
     gap = max(1, int(args.fallback_gap_ms))  # ms
     t = 0
     retimed = []
-    for (_, avatar_url, author, runs) in messages:
-        retimed.append((t, avatar_url, author, runs))
+    for (_, avatar_key, author, runs) in messages:
+        retimed.append((t, avatar_key, author, runs))
         t += gap
     messages = retimed
     max_duration_seconds = messages[-1][0] / 1000.0
@@ -319,24 +422,53 @@ if duration_seconds <= 0.0:
     raise SystemExit(f"Error: Computed duration is 0s (start={start_time_seconds}s, end={end_time_seconds}s). "
                      "Input appears to have no usable timing; try a different JSON or increase --fallback-gap-ms.")
 
-# -------- ffmpeg pipe --------
-try:
-    ffmpeg = subprocess.Popen([
-        'ffmpeg',
-        '-y',
-        '-f', 'rawvideo',
-        '-pix_fmt', ('rgba' if args.transparent else 'rgb24'),
-        '-s', f'{width}x{height}',
-        '-r', str(fps),
-        '-i', '-',           # stdin
-        '-an',
-        '-vcodec', ('libvpx-vp9' if args.transparent else 'libx264'),
-        '-pix_fmt', ('yuva420p' if args.transparent else 'yuv420p'),
-        args.output
-    ], stdin=subprocess.PIPE)  # keep stderr visible for debugging
-except Exception:
-    print("Error: ffmpeg not found. Install it and retry.")
-    raise
+# -------- ffmpeg availability / encoder selection --------
+if shutil.which('ffmpeg') is None:
+    raise SystemExit("Error: ffmpeg not found. Install it and retry.")
+
+def EncoderWorks(encoder):
+    """
+    One-frame test encode. ffmpeg lists compiled-in hardware encoders even
+    when the GPU or driver is absent (stock distro builds always show
+    h264_nvenc), and they only fail once encoding starts — so probe with a
+    throwaway frame instead of trusting the -encoders listing.
+    """
+    try:
+        return subprocess.run(
+            ['ffmpeg', '-hide_banner', '-v', 'error',
+             '-f', 'lavfi', '-i', 'color=black:size=64x64',
+             '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15,
+        ).returncode == 0
+    except Exception:
+        return False
+
+def PickVideoEncoder():
+    if args.encoder:
+        return args.encoder
+    if args.transparent:
+        # Alpha output needs VP9-in-WebM; hardware encoders can't carry it.
+        return 'libvpx-vp9'
+    # NVENC encodes 5-10x faster than libx264 and accepts software frames
+    # directly, so prefer it when it actually runs on this machine.
+    try:
+        out = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                             capture_output=True, text=True, timeout=15).stdout
+    except Exception:
+        out = ''
+    if ' h264_nvenc ' in out and EncoderWorks('h264_nvenc'):
+        return 'h264_nvenc'
+    return 'libx264'
+
+video_encoder = PickVideoEncoder()
+print(f"Using video encoder: {video_encoder}")
+
+encoder_flags = []
+if video_encoder == 'libvpx-vp9':
+    # libvpx is effectively single-threaded by default; row-based
+    # multithreading plus the realtime deadline uses the whole machine.
+    encoder_flags = ['-row-mt', '1', '-threads', str(os.cpu_count() or 4),
+                     '-cpu-used', '4', '-deadline', 'realtime']
 
 # -------- Drawing setup --------
 
@@ -354,47 +486,104 @@ skip_emojis = args.skip_emojis
 cache_to_disk = args.use_cache
 cache_folder = "yt-chat-to-video_cache"
 
-def GetCachedImageKey(path):
-    no_extension, _ = os.path.splitext(path)
-    no_protocol = no_extension.split('://', 1)[-1]
-    safe_key = re.sub(r'[^a-zA-Z0-9_-]', '_', no_protocol)
-    return safe_key
-
 cache = {}
+disk_cached_keys = set()
 
 if cache_to_disk:
+    cache_index_path = os.path.join(cache_folder, "cache_index.json")
     if not os.path.exists(cache_folder):
         os.mkdir(cache_folder)
     else:
-        print("Loading cached images from disk...")
-        for filename in os.listdir(cache_folder):
-            try:
-                img_cached = Image.open(os.path.join(cache_folder, filename)).convert("RGBA")
-                cache_key = GetCachedImageKey(filename)
-                cache[cache_key] = img_cached
-            except Exception:
-                pass
-        print(f"{len(cache)} images loaded from cache")
+        # Images on disk were resized for the scale they were cached at;
+        # the index records it so a --scale change invalidates them without
+        # decoding anything.
+        stale_cache = False
+        try:
+            with open(cache_index_path, "rb") as f:
+                stale_cache = _json_loads(f.read()).get("scale") != chat_scale
+        except Exception:
+            pass
+        if stale_cache:
+            # Purge, don't just ignore: the index below is rewritten with
+            # the current scale, and leaving the old PNGs behind would make
+            # the next run at this scale treat them as valid.
+            print("Warning: Disk cache was written at a different --scale — clearing it")
+            for filename in os.listdir(cache_folder):
+                if filename.endswith('.png'):
+                    try:
+                        os.remove(os.path.join(cache_folder, filename))
+                    except OSError:
+                        pass
+        else:
+            # Just list the keys; entries are decoded on demand, so startup
+            # doesn't pay for cached images this chat never references.
+            disk_cached_keys = {filename[:-4] for filename in os.listdir(cache_folder)
+                                if filename.endswith('.png')}
+            print(f"{len(disk_cached_keys)} cached images available on disk")
+    with open(cache_index_path, "w", encoding="utf-8") as f:
+        json.dump({"scale": chat_scale}, f)
 else:
     print("\nHint: Add --use-cache to avoid re-downloading avatars/emojis next run\n")
 
-# Pre-download avatars
-if not skip_avatars:
-    for _, avatar_url, _, _ in messages:
-        if not avatar_url:
-            continue
-        cache_key = GetCachedImageKey(avatar_url)
-        if cache_key not in cache:
-            print(f"Downloading avatar: {avatar_url}")
+def LoadCachedImages(keys):
+    """Decode only the disk-cache entries this chat actually references."""
+    for key in keys:
+        if key not in cache:
             try:
-                response = requests.get(avatar_url, timeout=15)
-                avatar = Image.open(BytesIO(response.content)).convert("RGBA")
-                avatar = avatar.resize((chat_avatar_size, chat_avatar_size), Image.LANCZOS)
-                cache[cache_key] = avatar
+                cache[key] = Image.open(os.path.join(cache_folder, f"{key}.png")).convert("RGBA")
+            except Exception:
+                pass  # treated as missing; the download step refetches it
+
+def DownloadImages(urls_by_key, size, kind, resample=Image.LANCZOS):
+    """
+    Fetch and resize every image in {cache_key: url} into `cache`.
+    One Session reuses connections and TLS state; the thread pool overlaps
+    the round trips that the old per-message loop paid one at a time.
+    Decode and resize stay on the main thread as responses complete.
+    """
+    if not urls_by_key:
+        return
+    print(f"Downloading {len(urls_by_key)} {kind}...")
+    session = None
+    if httpx is not None:
+        try:
+            session = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                timeout=15,
+            )
+        except Exception:
+            session = None  # http2 extra (h2) missing — use requests
+    if session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = {pool.submit(session.get, url, timeout=15): (key, url)
+                   for key, url in urls_by_key.items()}
+        for future in as_completed(futures):
+            key, url = futures[future]
+            try:
+                response = future.result()
+                image = Image.open(BytesIO(response.content))
+                # JPEG sources (the usual avatar format) can downsample in
+                # the decoder itself; draft is a no-op for PNG/WebP.
+                image.draft('RGB', (size * 2, size * 2))
+                image = image.convert("RGBA").resize((size, size), resample)
+                cache[key] = image
                 if cache_to_disk:
-                    avatar.save(os.path.join(cache_folder, f"{cache_key}.png"))
+                    image.save(os.path.join(cache_folder, f"{key}.png"))
             except Exception:
-                print(f"Warning: Can't download avatar: {avatar_url}")
+                print(f"Warning: Can't download image: {url}")
+    session.close()
+
+# Pre-download avatars: normalization already deduped keys, so just fetch
+# whatever the disk cache didn't cover.
+if not skip_avatars:
+    LoadCachedImages(avatar_urls_by_key.keys() & disk_cached_keys)
+    pending = {key: url for key, url in avatar_urls_by_key.items() if key not in cache}
+    DownloadImages(pending, chat_avatar_size, "avatars")
 
 def CreateAvatarMask(size, scale):
     hires_size = size * scale
@@ -406,127 +595,181 @@ def CreateAvatarMask(size, scale):
 
 avatar_mask = CreateAvatarMask(chat_avatar_size, 4)
 
-# Pre-download emojis
+# Pre-download emojis, same scheme as avatars.
 if not skip_emojis:
-    for _, _, _, runs in messages:
-        for run in runs:
-            if run[0] == 1:
-                emoji_url = run[1]
-                cache_key = GetCachedImageKey(emoji_url)
-                if cache_key not in cache:
-                    print(f"Downloading emoji: {emoji_url}")
-                    try:
-                        response = requests.get(emoji_url, timeout=15)
-                        emoji = Image.open(BytesIO(response.content)).convert("RGBA")
-                        emoji = emoji.resize((chat_emoji_size, chat_emoji_size), Image.LANCZOS)
-                        cache[cache_key] = emoji
-                        if cache_to_disk:
-                            emoji.save(os.path.join(cache_folder, f"{cache_key}.png"))
-                    except Exception:
-                        print(f"Warning: Can't download emoji: {emoji_url}")
+    LoadCachedImages(emoji_urls_by_key.keys() & disk_cached_keys)
+    pending = {key: url for key, url in emoji_urls_by_key.items() if key not in cache}
+    # BILINEAR: emoji sprites render at 16 px, where LANCZOS is
+    # indistinguishable and several times slower.
+    DownloadImages(pending, chat_emoji_size, "emojis", resample=Image.BILINEAR)
 
 # -------- Rendering --------
 
 current_message_index = -1
 
-def DrawChat():
-    # bg
-    if args.transparent:
-        draw.rectangle([0, 0, width, height], fill=(0, 0, 0, 0))
+# Rendered strip per message index. Message contents never change within a
+# run, so each strip is laid out and rasterized exactly once; redraws just
+# paste cached strips at new Y positions. Entries are evicted once they
+# scroll off the top, since older messages can never become visible again.
+_strip_cache = {}
+
+def RenderMessageStrip(i):
+    cached = _strip_cache.get(i)
+    if cached is not None:
+        return cached
+
+    message = messages[i]
+
+    avatar_x = chat_inner_x
+    author_x = avatar_x + chat_avatar_size + chat_avatar_padding
+    runs_x = author_x + _author_width(message[2]) + char_author_padding
+
+    num_lines = 1
+    runs_draw = []
+    run_x, run_y = runs_x, 0
+
+    for run_type, content in message[3]:
+        if run_type == 0:  # text
+            for word in content.split(" "):
+                word_width = _word_width(word + " ")
+                if run_x + word_width > chat_inner_width:
+                    num_lines += 1
+                    run_x = author_x
+                    run_y += chat_line_height
+                runs_draw.append((0, run_x, run_y, word))
+                run_x += word_width
+        else:  # emoji
+            emoji = cache.get(content)
+            if emoji:
+                emoji_w = emoji.size[0]
+                if run_x + emoji_w > chat_inner_width:
+                    num_lines += 1
+                    run_x = author_x
+                    run_y += chat_line_height
+                runs_draw.append((1, run_x, run_y, emoji))
+                run_x += emoji_w
+
+    if num_lines == 1:
+        message_height = chat_avatar_size + ((4 + 4) * chat_scale)
+        avatar_y = 4 * chat_scale
+        author_y = 8 * chat_scale
+        runs_y = 8 * chat_scale
     else:
-        draw.rectangle([0, 0, width, height], fill=chat_background)
+        message_height = (num_lines * chat_line_height) + ((4 + 4) * chat_scale)
+        avatar_y = 4 * chat_scale
+        author_y = 4 * chat_scale
+        runs_y = 4 * chat_scale
+
+    strip = Image.new('RGBA', (width, message_height), (0, 0, 0, 0))
+    strip_draw = ImageDraw.Draw(strip)
+
+    avatar = cache.get(message[1])
+    if avatar:
+        strip.paste(avatar, (avatar_x, avatar_y), mask=avatar_mask)
+
+    strip_draw.text((author_x, author_y), message[2], font=chat_author_font, fill=chat_author_color)
 
-    y = 0
-    layout = []
-
-    # from current message back to first
-    for i in range(current_message_index, -1, -1):
-        message = messages[i]
-
-        avatar_x = chat_inner_x
-        author_x = avatar_x + chat_avatar_size + chat_avatar_padding
-        runs_x = author_x + chat_author_font.getbbox(message[2])[2] + char_author_padding
-
-        num_lines = 1
-        runs_draw = []
-        run_x, run_y = runs_x, 0
-
-        for run_type, content in message[3]:
-            if run_type == 0:  # text
-                for word in content.split(" "):
-                    word_width = chat_message_font.getbbox(word + " ")[2]
-                    if run_x + word_width > chat_inner_width:
-                        num_lines += 1
-                        run_x = author_x
-                        run_y += chat_line_height
-                    runs_draw.append((0, run_x, run_y, word))
-                    run_x += word_width
-            else:  # emoji
-                emoji = cache.get(GetCachedImageKey(content))
-                if emoji:
-                    emoji_w = emoji.size[0]
-                    if run_x + emoji_w > chat_inner_width:
-                        num_lines += 1
-                        run_x = author_x
-                        run_y += chat_line_height
-                    runs_draw.append((1, run_x, run_y, emoji))
-                    run_x += emoji_w
-
-        if num_lines == 1:
-            message_height = chat_avatar_size + ((4 + 4) * chat_scale)
-            avatar_y = 4 * chat_scale
-            author_y = 8 * chat_scale
-            runs_y = 8 * chat_scale
+    for run_type, run_x, run_y, content in runs_draw:
+        if run_type == 0:
+            strip_draw.text((run_x, runs_y + run_y), content, font=chat_message_font, fill=chat_message_color)
         else:
-            message_height = (num_lines * chat_line_height) + ((4 + 4) * chat_scale)
-            avatar_y = 4 * chat_scale
-            author_y = 4 * chat_scale
-            runs_y = 4 * chat_scale
+            # True Porter-Duff over in C — paste with a self-mask writes
+            # wrong alpha onto the transparent strip at soft emoji edges.
+            strip.alpha_composite(content, (run_x, runs_y + run_y))
 
-        y += message_height
-        no_more_space = y > height
+    _strip_cache[i] = strip
+    return strip
 
-        if not args.no_clip and no_more_space:
-            break
+# Persistent visible window: messages only ever enter at the bottom and
+# leave at the top, so instead of re-walking backwards from the newest
+# message on every redraw, keep the laid-out strips in a deque with a
+# running height and fold in just the newly arrived ones.
+_visible = deque()
+_visible_total_h = 0
+_visible_last_index = -1
 
-        layout.append((message_height, message, avatar_x, avatar_y, author_x, author_y, runs_y, runs_draw))
+def DrawChat():
+    global _visible_total_h, _visible_last_index
+
+    for i in range(_visible_last_index + 1, current_message_index + 1):
+        strip = RenderMessageStrip(i)
+        _visible.append(strip)
+        _visible_total_h += strip.size[1]
+    _visible_last_index = max(_visible_last_index, current_message_index)
+
+    if args.no_clip:
+        # Default mode: the topmost message may render partially clipped,
+        # so keep it while the rest alone doesn't already fill the view.
+        while len(_visible) > 1 and _visible_total_h - _visible[0].size[1] > height:
+            _visible_total_h -= _visible.popleft().size[1]
+    else:
+        while _visible and _visible_total_h > height:
+            _visible_total_h -= _visible.popleft().size[1]
 
-        if args.no_clip and no_more_space:
-            break
+    # bg
+    if args.transparent:
+        draw.rectangle([0, 0, width, height], fill=(0, 0, 0, 0))
+    else:
+        draw.rectangle([0, 0, width, height], fill=chat_background)
 
     # draw from bottom up
     y = height
-    for message_height, message, avatar_x, avatar_y, author_x, author_y, runs_y, runs_draw in layout:
-        _, avatar_url, author, _ = message
-        y -= message_height
-
-        avatar = cache.get(GetCachedImageKey(avatar_url))
-        if avatar:
-            img.paste(avatar, (avatar_x, y + avatar_y), mask=avatar_mask)
-
-        draw.text((author_x, y + author_y), author, font=chat_author_font, fill=chat_author_color)
+    for strip in reversed(_visible):
+        y -= strip.size[1]
+        if args.transparent:
+            img.alpha_composite(strip, (0, y))
+        else:
+            img.paste(strip, (0, y), mask=strip)
 
-        for run_type, run_x, run_y, content in runs_draw:
-            if run_type == 0:
-                draw.text((run_x, y + runs_y + run_y), content, font=chat_message_font, fill=chat_message_color)
-            else:
-                img.paste(content, (run_x, y + runs_y + run_y), mask=content)
+    # Evict strips that scrolled off for good.
+    lowest = current_message_index - len(_visible) + 1
+    for k in [k for k in _strip_cache if k < lowest]:
+        del _strip_cache[k]
 
-# Frame loop
-redraw = True
+# Render schedule: the image only changes when a message becomes visible,
+# so instead of stepping through every output frame, compute the frame
+# index at which each message first appears and render once per event.
+# Work drops from O(fps * duration) to O(messages).
 num_frames = int(round(fps * duration_seconds))
 if num_frames < 1:
     raise SystemExit(f"Error: Computed frame count is {num_frames}. "
                      f"fps={fps}, duration={duration_seconds}s. Aborting to avoid empty video.")
 
-for i in range(num_frames):
-    t_ms = int((start_time_seconds + (i / fps)) * 1000)
+# Timestamp column: the schedule below only needs times, so pull them out
+# of the tuples once instead of indexing per message, and binary-search the
+# start position instead of stepping through it.
+message_times = [m[0] for m in messages]
+
+def _first_visible_frame(m_time_ms):
+    """Smallest frame index whose timestamp lies strictly past m_time_ms."""
+    i = max(0, math.ceil(((m_time_ms + 1) / 1000.0 - start_time_seconds) * fps))
+    # Settle float rounding against the exact per-frame timestamp formula.
+    while i > 0 and int((start_time_seconds + ((i - 1) / fps)) * 1000) > m_time_ms:
+        i -= 1
+    while int((start_time_seconds + (i / fps)) * 1000) <= m_time_ms:
+        i += 1
+    return i
+
+# Fast-forward past messages already visible at the first frame.
+start_ms = int(start_time_seconds * 1000)
+first_index = bisect_left(message_times, start_ms) - 1
+
+events = [[0, first_index]]  # [frame index, last visible message index]
+for j in range(first_index + 1, len(message_times)):
+    f = _first_visible_frame(message_times[j])
+    if f >= num_frames:
+        break
+    if f == events[-1][0]:
+        events[-1][1] = j
+    else:
+        events.append([f, j])
 
-    while current_message_index + 1 < len(messages) and t_ms > messages[current_message_index + 1][0]:
-        current_message_index += 1
-        redraw = True
+frames_dir = tempfile.mkdtemp(prefix="yt-chat-to-video_frames_")
+frame_entries = []  # [png path, held frame count]
 
-    if redraw:
+try:
+    for k, (frame_idx, msg_idx) in enumerate(events):
+        current_message_index = msg_idx
         try:
             DrawChat()
         except Exception as e:
@@ -536,11 +779,41 @@ for i in range(num_frames):
             if e and "images do not match" in str(e):
                 print("\nTip: delete the 'yt-chat-to-video_cache' folder after changing --scale.\n")
             break
-        redraw = False
-
-    ffmpeg.stdin.write(img.tobytes())
-    print(f"\rGenerating video frames... {i+1}/{num_frames} ({round(((i+1) / num_frames) * 100)}%)", end="")
+        frame_path = os.path.join(frames_dir, f"frame_{k}.png")
+        img.save(frame_path, compress_level=1)
+        next_frame = events[k + 1][0] if k + 1 < len(events) else num_frames
+        frame_entries.append([frame_path, next_frame - frame_idx])
+
+        print(f"\rGenerating video frames... {k+1}/{len(events)} ({round(((k+1) / len(events)) * 100)}%)", end="")
+
+    if not frame_entries:
+        raise SystemExit("Error: No frames were generated")
+
+    concat_path = os.path.join(frames_dir, "frames.txt")
+    with open(concat_path, "w", encoding="utf-8") as f:
+        f.write("ffconcat version 1.0\n")
+        for frame_path, held in frame_entries:
+            f.write(f"file '{frame_path}'\nduration {held / fps:.6f}\n")
+        # concat demuxer quirk: repeat the last file so its duration sticks
+        f.write(f"file '{frame_entries[-1][0]}'\n")
+
+    print(f"\nEncoding {len(frame_entries)} distinct frames...")
+    rc = subprocess.run([
+        'ffmpeg',
+        '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', concat_path,
+        '-vf', f'fps={fps}',
+        '-an',
+        '-vcodec', video_encoder,
+        *encoder_flags,
+        '-pix_fmt', ('yuva420p' if args.transparent else 'yuv420p'),
+        args.output
+    ]).returncode  # keep stderr visible for debugging
+    if rc != 0:
+        raise SystemExit(f"Error: ffmpeg exited with code {rc}")
+finally:
+    shutil.rmtree(frames_dir, ignore_errors=True)
 
-print("\nDone!")
-ffmpeg.stdin.close()
-ffmpeg.wait()
+print("Done!")